@@ -12,15 +12,14 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from src.config import settings
-from src.db.session import Base
-from src.models import models  # noqa: F401 - imported for side effects (model registration)
+from src.config import get_settings
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
 
 # Override sqlalchemy.url with our DATABASE_URL from settings
+settings = get_settings()
 config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
 
 # Interpret the config file for Python logging.
@@ -28,9 +27,28 @@ config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
-# add your model's MetaData object here
-# for 'autogenerate' support
-target_metadata = Base.metadata
+
+def get_target_metadata():
+    """Return the models' MetaData when the command compares it, else None.
+
+    Importing the models builds every mapper (and the app's DB engine), which
+    upgrade/downgrade/current never use. Only autogenerate and ``alembic check``
+    need it; programmatic calls without cmd_opts load it to be safe.
+    """
+    cmd_opts = config.cmd_opts
+    needs_metadata = (
+        cmd_opts is None
+        or getattr(cmd_opts, "autogenerate", False)
+        or cmd_opts.cmd[0].__name__ == "check"
+    )
+    if not needs_metadata:
+        return None
+
+    from src.db.session import Base
+    from src.models import models  # noqa: F401 - imported for side effects (model registration)
+
+    return Base.metadata
+
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -53,7 +71,7 @@ def run_migrations_offline() -> None:
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
         url=url,
-        target_metadata=target_metadata,
+        target_metadata=get_target_metadata(),
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -69,15 +87,32 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    # NullPool suits one-shot production runs. Set ALEMBIC_POOL=queue to keep
+    # a single pooled connection instead (dev loops, test suites).
+    if os.getenv("ALEMBIC_POOL", "null").lower() == "queue":
+        pool_options = {"poolclass": pool.QueuePool, "pool_size": 1, "max_overflow": 0}
+    else:
+        pool_options = {"poolclass": pool.NullPool}
+
+    # Migrations run on a freshly opened connection, so a pre-ping is a wasted
+    # round-trip. A migration is one transaction: if the server crashes before
+    # its commit is flushed, the whole revision (including alembic_version) is
+    # rolled back together, so synchronous_commit can be off for this session.
+    connect_args = {}
+    if settings.DATABASE_URL.startswith("postgresql"):
+        connect_args["options"] = "-c synchronous_commit=off"
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
-        poolclass=pool.NullPool,
+        pool_pre_ping=False,
+        connect_args=connect_args,
+        **pool_options,
     )
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=get_target_metadata()
         )
 
         with context.begin_transaction():
@@ -1,10 +1,10 @@
 """Initial ledger schema
 
-Revision ID: 001
+Revision ID: 001_initial_ledger_schema
 Revises: 
 Create Date: 2025-01-01 00:00:00.000000
 
-This migration applies the initial ledger schema from SQL file.
+This migration creates the initial ledger schema.
 """
 from typing import Sequence, Union
 from alembic import op
@@ -12,21 +12,21 @@ import sqlalchemy as sa
 from sqlalchemy.dialects import postgresql
 
 # revision identifiers, used by Alembic.
-revision: str = '001'
+revision: str = '001_initial_ledger_schema'
 down_revision: Union[str, None] = None
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
-    """Apply the initial schema from SQL file."""
-    # Create UUID extension
-    op.execute('CREATE EXTENSION IF NOT EXISTS "uuid-ossp"')
+    """Create the initial ledger schema."""
+    # Primary keys default to gen_random_uuid(), which is built into
+    # PostgreSQL 13+ and needs no extension.
     
     # Create logical_accounts table
     op.create_table(
         'logical_accounts',
-        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
         sa.Column('account_name', sa.String(255), nullable=False, unique=True),
         sa.Column('account_type', sa.String(50), nullable=False),
         sa.Column('description', sa.Text),
@@ -40,7 +40,7 @@ def upgrade() -> None:
     # Create ledger_transactions table
     op.create_table(
         'ledger_transactions',
-        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
         sa.Column('transaction_date', sa.TIMESTAMP(timezone=True), nullable=False, server_default=sa.func.now()),
         sa.Column('account_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('logical_accounts.id'), nullable=False),
         sa.Column('amount', sa.DECIMAL(20, 8), nullable=False),
@@ -57,7 +57,7 @@ def upgrade() -> None:
     # Create allocation_rules table
     op.create_table(
         'allocation_rules',
-        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
         sa.Column('rule_name', sa.String(255), nullable=False, unique=True),
         sa.Column('source_account_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('logical_accounts.id'), nullable=False),
         sa.Column('allocation_config', postgresql.JSONB, nullable=False),
@@ -71,7 +71,7 @@ def upgrade() -> None:
     # Create audit_log table
     op.create_table(
         'audit_log',
-        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
         sa.Column('entity_type', sa.String(100), nullable=False),
         sa.Column('entity_id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('action', sa.String(50), nullable=False),
@@ -86,11 +86,12 @@ def upgrade() -> None:
     # Create reconciliation_log table
     op.create_table(
         'reconciliation_log',
-        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
         sa.Column('account_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('logical_accounts.id'), nullable=False),
         sa.Column('reconciliation_date', sa.TIMESTAMP(timezone=True), nullable=False),
         sa.Column('expected_balance', sa.DECIMAL(20, 8), nullable=False),
         sa.Column('actual_balance', sa.DECIMAL(20, 8), nullable=False),
+        sa.Column('variance', sa.DECIMAL(20, 8), sa.Computed('actual_balance - expected_balance', persisted=True)),
         sa.Column('status', sa.String(50), nullable=False),
         sa.Column('notes', sa.Text),
         sa.Column('reconciled_by', sa.String(255)),
@@ -99,60 +100,25 @@ def upgrade() -> None:
         sa.CheckConstraint("status IN ('pending', 'matched', 'variance', 'resolved')")
     )
     
-    # Add computed variance column
+    # Create indexes in a single round-trip.
+    # account_id lookups are served by the covering (account_id,
+    # transaction_date) index added in 004_ledger_query_indexes.
     op.execute("""
-        ALTER TABLE reconciliation_log 
-        ADD COLUMN variance DECIMAL(20, 8) 
-        GENERATED ALWAYS AS (actual_balance - expected_balance) STORED
-    """)
-    
-    # Create indexes
-    op.create_index('idx_ledger_transactions_account_id', 'ledger_transactions', ['account_id'])
-    op.create_index('idx_ledger_transactions_transaction_date', 'ledger_transactions', ['transaction_date'])
-    op.create_index('idx_ledger_transactions_reference_id', 'ledger_transactions', ['reference_id'])
-    op.create_index('idx_allocation_rules_source_account_id', 'allocation_rules', ['source_account_id'])
-    op.create_index('idx_allocation_rules_is_active', 'allocation_rules', ['is_active'])
-    op.create_index('idx_audit_log_entity_type_id', 'audit_log', ['entity_type', 'entity_id'])
-    op.create_index('idx_audit_log_timestamp', 'audit_log', ['timestamp'])
-    op.create_index('idx_reconciliation_log_account_id', 'reconciliation_log', ['account_id'])
-    op.create_index('idx_reconciliation_log_status', 'reconciliation_log', ['status'])
-    
-    # Create triggers for updated_at
-    op.execute("""
-        CREATE OR REPLACE FUNCTION update_updated_at_column()
-        RETURNS TRIGGER AS $$
-        BEGIN
-            NEW.updated_at = NOW();
-            RETURN NEW;
-        END;
-        $$ LANGUAGE plpgsql;
-    """)
-    
-    op.execute("""
-        CREATE TRIGGER update_logical_accounts_updated_at
-        BEFORE UPDATE ON logical_accounts
-        FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
-    """)
-    
-    op.execute("""
-        CREATE TRIGGER update_ledger_transactions_updated_at
-        BEFORE UPDATE ON ledger_transactions
-        FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
-    """)
-    
-    op.execute("""
-        CREATE TRIGGER update_allocation_rules_updated_at
-        BEFORE UPDATE ON allocation_rules
-        FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+        CREATE INDEX idx_ledger_transactions_transaction_date ON ledger_transactions (transaction_date);
+        CREATE INDEX idx_ledger_transactions_reference_id ON ledger_transactions (reference_id);
+        CREATE INDEX idx_allocation_rules_source_account_id ON allocation_rules (source_account_id);
+        CREATE INDEX idx_allocation_rules_is_active ON allocation_rules (is_active);
+        CREATE INDEX idx_audit_log_entity_type_id ON audit_log (entity_type, entity_id);
+        CREATE INDEX idx_audit_log_timestamp ON audit_log (timestamp);
+        CREATE INDEX idx_reconciliation_log_account_id ON reconciliation_log (account_id);
+        CREATE INDEX idx_reconciliation_log_status ON reconciliation_log (status);
     """)
 
 
 def downgrade() -> None:
-    """Remove all tables and extensions."""
+    """Remove all tables."""
     op.drop_table('reconciliation_log')
     op.drop_table('audit_log')
     op.drop_table('allocation_rules')
     op.drop_table('ledger_transactions')
     op.drop_table('logical_accounts')
-    op.execute('DROP FUNCTION IF EXISTS update_updated_at_column()')
-    op.execute('DROP EXTENSION IF EXISTS "uuid-ossp"')
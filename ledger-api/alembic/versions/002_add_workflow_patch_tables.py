@@ -7,7 +7,7 @@ Create Date: 2024-12-11 20:55:00
 """
 from alembic import op
 import sqlalchemy as sa
-from sqlalchemy.dialects.postgresql import UUID, JSONB, INET, TIMESTAMP
+from sqlalchemy.dialects.postgresql import UUID, JSONB, INET, TIMESTAMP, ENUM
 
 # revision identifiers, used by Alembic.
 revision = '002_workflow_patches'
@@ -19,19 +19,29 @@ depends_on = None
 def upgrade() -> None:
     """Create workflow patch and analysis tables."""
     
+    # Create enum types for the fixed-vocabulary columns
+    op.execute("""
+        CREATE TYPE patch_type AS ENUM ('bug_fix', 'performance', 'security', 'feature', 'refactor');
+        CREATE TYPE patch_status AS ENUM ('pending', 'testing', 'tested', 'approved', 'deployed', 'failed', 'rolled_back');
+        CREATE TYPE patch_severity AS ENUM ('critical', 'high', 'medium', 'low');
+        CREATE TYPE analysis_type AS ENUM ('security', 'performance', 'efficiency', 'compatibility', 'quality');
+        CREATE TYPE analysis_severity AS ENUM ('critical', 'high', 'medium', 'low', 'info');
+        CREATE TYPE analysis_status AS ENUM ('new', 'in_progress', 'addressed', 'ignored');
+    """)
+    
     # Create workflow_patches table
     op.create_table(
         'workflow_patches',
         sa.Column('id', UUID(as_uuid=True), primary_key=True),
         sa.Column('patch_name', sa.String(255), nullable=False),
         sa.Column('patch_version', sa.String(50), nullable=False),
-        sa.Column('patch_type', sa.String(50), nullable=False),
+        sa.Column('patch_type', ENUM(name='patch_type', create_type=False), nullable=False),
         sa.Column('description', sa.Text, nullable=False),
         sa.Column('target_workflow', sa.String(255), nullable=False),
         sa.Column('issue_identified', sa.Text, nullable=False),
         sa.Column('patch_content', JSONB, nullable=False),
-        sa.Column('status', sa.String(50), nullable=False, server_default='pending'),
-        sa.Column('severity', sa.String(50), nullable=False),
+        sa.Column('status', ENUM(name='patch_status', create_type=False), nullable=False, server_default='pending'),
+        sa.Column('severity', ENUM(name='patch_severity', create_type=False), nullable=False),
         sa.Column('created_by', sa.String(255), server_default='WorkflowPatchAgent'),
         sa.Column('reviewed_by', sa.String(255)),
         sa.Column('approved_by', sa.String(255)),
@@ -42,58 +52,38 @@ def upgrade() -> None:
         sa.Column('created_at', TIMESTAMP(timezone=True), server_default=sa.func.now()),
         sa.Column('tested_at', TIMESTAMP(timezone=True)),
         sa.Column('deployed_at', TIMESTAMP(timezone=True)),
-        sa.Column('rolled_back_at', TIMESTAMP(timezone=True)),
-        sa.CheckConstraint(
-            "patch_type IN ('bug_fix', 'performance', 'security', 'feature', 'refactor')",
-            name='check_patch_type'
-        ),
-        sa.CheckConstraint(
-            "status IN ('pending', 'testing', 'tested', 'approved', 'deployed', 'failed', 'rolled_back')",
-            name='check_patch_status'
-        ),
-        sa.CheckConstraint(
-            "severity IN ('critical', 'high', 'medium', 'low')",
-            name='check_patch_severity'
-        )
+        sa.Column('rolled_back_at', TIMESTAMP(timezone=True))
     )
     
-    # Create indexes for workflow_patches
-    op.create_index('idx_workflow_patches_status', 'workflow_patches', ['status'])
-    op.create_index('idx_workflow_patches_target_workflow', 'workflow_patches', ['target_workflow'])
-    op.create_index('idx_workflow_patches_created_at', 'workflow_patches', ['created_at'])
-    
     # Create workflow_analysis table
     op.create_table(
         'workflow_analysis',
         sa.Column('id', UUID(as_uuid=True), primary_key=True),
         sa.Column('workflow_name', sa.String(255), nullable=False),
-        sa.Column('analysis_type', sa.String(50), nullable=False),
+        sa.Column('analysis_type', ENUM(name='analysis_type', create_type=False), nullable=False),
         sa.Column('findings', JSONB, nullable=False),
         sa.Column('metrics', JSONB),
         sa.Column('recommendations', JSONB),
-        sa.Column('severity', sa.String(50), nullable=False),
-        sa.Column('status', sa.String(50), nullable=False, server_default='new'),
+        sa.Column('severity', ENUM(name='analysis_severity', create_type=False), nullable=False),
+        sa.Column('status', ENUM(name='analysis_status', create_type=False), nullable=False, server_default='new'),
         sa.Column('analyzed_by', sa.String(255), server_default='WorkflowPatchAgent'),
         sa.Column('created_at', TIMESTAMP(timezone=True), server_default=sa.func.now()),
-        sa.Column('addressed_at', TIMESTAMP(timezone=True)),
-        sa.CheckConstraint(
-            "analysis_type IN ('security', 'performance', 'efficiency', 'compatibility', 'quality')",
-            name='check_analysis_type'
-        ),
-        sa.CheckConstraint(
-            "severity IN ('critical', 'high', 'medium', 'low', 'info')",
-            name='check_analysis_severity'
-        ),
-        sa.CheckConstraint(
-            "status IN ('new', 'in_progress', 'addressed', 'ignored')",
-            name='check_analysis_status'
-        )
+        sa.Column('addressed_at', TIMESTAMP(timezone=True))
     )
     
-    # Create indexes for workflow_analysis
-    op.create_index('idx_workflow_analysis_workflow_name', 'workflow_analysis', ['workflow_name'])
-    op.create_index('idx_workflow_analysis_status', 'workflow_analysis', ['status'])
-    op.create_index('idx_workflow_analysis_severity', 'workflow_analysis', ['severity'])
+    # Create indexes for both tables in a single round-trip.
+    # Status indexes are partial: lookups target the small set of patches and
+    # analyses still being worked on, not the deployed/addressed history.
+    op.execute("""
+        CREATE INDEX idx_workflow_patches_status_active ON workflow_patches (status)
+            WHERE status IN ('pending', 'testing', 'tested', 'approved');
+        CREATE INDEX idx_workflow_patches_target_workflow ON workflow_patches (target_workflow);
+        CREATE INDEX idx_workflow_patches_created_at ON workflow_patches (created_at);
+        CREATE INDEX idx_workflow_analysis_workflow_name ON workflow_analysis (workflow_name);
+        CREATE INDEX idx_workflow_analysis_status_open ON workflow_analysis (status)
+            WHERE status IN ('new', 'in_progress');
+        CREATE INDEX idx_workflow_analysis_severity ON workflow_analysis (severity);
+    """)
 
 
 def downgrade() -> None:
@@ -101,7 +91,7 @@ def downgrade() -> None:
     
     # Drop indexes for workflow_analysis
     op.drop_index('idx_workflow_analysis_severity', 'workflow_analysis')
-    op.drop_index('idx_workflow_analysis_status', 'workflow_analysis')
+    op.drop_index('idx_workflow_analysis_status_open', 'workflow_analysis')
     op.drop_index('idx_workflow_analysis_workflow_name', 'workflow_analysis')
     
     # Drop workflow_analysis table
@@ -110,7 +100,17 @@ def downgrade() -> None:
     # Drop indexes for workflow_patches
     op.drop_index('idx_workflow_patches_created_at', 'workflow_patches')
     op.drop_index('idx_workflow_patches_target_workflow', 'workflow_patches')
-    op.drop_index('idx_workflow_patches_status', 'workflow_patches')
+    op.drop_index('idx_workflow_patches_status_active', 'workflow_patches')
     
     # Drop workflow_patches table
     op.drop_table('workflow_patches')
+    
+    # Drop enum types once no column uses them
+    op.execute("""
+        DROP TYPE analysis_status;
+        DROP TYPE analysis_severity;
+        DROP TYPE analysis_type;
+        DROP TYPE patch_severity;
+        DROP TYPE patch_status;
+        DROP TYPE patch_type;
+    """)
@@ -0,0 +1,35 @@
+"""003_audit_log_brin_timestamp
+
+Revision ID: 003_audit_log_brin
+Revises: 002_workflow_patches
+Create Date: 2026-10-16 09:00:00
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '003_audit_log_brin'
+down_revision = '002_workflow_patches'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Replace the audit_log timestamp B-tree with a BRIN index."""
+    
+    # audit_log is append-only, so timestamp follows physical row order and a
+    # BRIN summary per 32 pages answers range scans at a fraction of the
+    # B-tree's size and insert cost
+    op.execute("""
+        DROP INDEX IF EXISTS idx_audit_log_timestamp;
+        CREATE INDEX idx_audit_log_timestamp ON audit_log
+            USING BRIN (timestamp) WITH (pages_per_range = 32);
+    """)
+
+
+def downgrade() -> None:
+    """Restore the B-tree index on audit_log timestamp."""
+    op.execute("""
+        DROP INDEX IF EXISTS idx_audit_log_timestamp;
+        CREATE INDEX idx_audit_log_timestamp ON audit_log (timestamp);
+    """)
@@ -0,0 +1,47 @@
+"""004_ledger_query_indexes
+
+Revision ID: 004_ledger_query_indexes
+Revises: 003_audit_log_brin
+Create Date: 2026-10-16 10:00:00
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '004_ledger_query_indexes'
+down_revision = '003_audit_log_brin'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add indexes shaped after the ledger's list and lookup queries."""
+    
+    # Account listings filter on account_id and page by transaction_date;
+    # the composite index returns rows already ordered (scanned backwards
+    # for DESC), and carrying amount, currency and transaction_type in its
+    # leaf pages lets balance sums and date-range totals run as index-only
+    # scans. reference_id is mostly NULL, so only index the rows that
+    # can match a lookup. Audit history for an entity is read in time order.
+    op.execute("""
+        CREATE INDEX idx_ledger_transactions_account_id_date
+            ON ledger_transactions (account_id, transaction_date)
+            INCLUDE (amount, currency, transaction_type);
+        DROP INDEX IF EXISTS idx_ledger_transactions_reference_id;
+        CREATE INDEX idx_ledger_transactions_reference_id ON ledger_transactions (reference_id)
+            WHERE reference_id IS NOT NULL;
+        DROP INDEX IF EXISTS idx_audit_log_entity_type_id;
+        CREATE INDEX idx_audit_log_entity_type_id_timestamp
+            ON audit_log (entity_type, entity_id, timestamp);
+    """)
+
+
+def downgrade() -> None:
+    """Restore the single-purpose indexes."""
+    op.execute("""
+        DROP INDEX IF EXISTS idx_audit_log_entity_type_id_timestamp;
+        CREATE INDEX idx_audit_log_entity_type_id ON audit_log (entity_type, entity_id);
+        DROP INDEX IF EXISTS idx_ledger_transactions_reference_id;
+        CREATE INDEX idx_ledger_transactions_reference_id ON ledger_transactions (reference_id);
+        DROP INDEX IF EXISTS idx_ledger_transactions_account_id_date;
+    """)
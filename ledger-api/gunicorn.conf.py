@@ -0,0 +1,45 @@
+"""
+Gunicorn configuration for production deployments.
+
+Runs the app under uvicorn workers (uvloop + httptools), one process per
+WORKERS, bound to HOST:PORT from the same settings as the API:
+
+    gunicorn -c gunicorn.conf.py src.main:app
+"""
+import glob
+import os
+import tempfile
+from src.config import get_settings
+
+settings = get_settings()
+
+bind = f"{settings.HOST}:{settings.PORT}"
+workers = settings.WORKERS
+worker_class = "src.workers.LedgerUvicornWorker"
+
+# Not preloaded: each worker builds its own engine and audit writer after
+# the fork, so no pooled connection or thread is shared across processes
+preload_app = False
+
+# Workers write their metrics to files here and /metrics aggregates them.
+# Set before any worker imports prometheus_client, which reads it on import.
+os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "ledger-api-metrics")
+)
+
+# Imported up front: child_exit runs from the SIGCHLD handler, where a
+# first-time import can be re-entered by the next worker exit
+from prometheus_client import multiprocess  # noqa: E402
+
+
+def on_starting(server):
+    """Start from an empty metrics directory; old files would skew totals."""
+    metrics_dir = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    os.makedirs(metrics_dir, exist_ok=True)
+    for path in glob.glob(os.path.join(metrics_dir, "*.db")):
+        os.remove(path)
+
+
+def child_exit(server, worker):
+    """Drop an exited worker's live gauges from the aggregated metrics."""
+    multiprocess.mark_process_dead(worker.pid)
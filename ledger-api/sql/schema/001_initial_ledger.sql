@@ -1,14 +1,18 @@
 -- Ledger API Database Schema
 -- This schema provides a single source of truth for ledger transactions, 
 -- logical accounts, allocation rules, audit logs, and reconciliation logs.
+--
+-- The Alembic revision alembic/versions/001_initial_ledger_schema.py is the
+-- source of truth and does not read this file; keep the two in sync when
+-- changing the schema. This script is for bootstrapping a database with psql
+-- without Alembic.
 
--- Create extension for UUID generation
-CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+-- UUID primary keys use gen_random_uuid(), built into PostgreSQL 13+
 
 -- Logical Accounts Table
 -- Stores all logical account definitions for the ledger system
 CREATE TABLE logical_accounts (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     account_name VARCHAR(255) NOT NULL UNIQUE,
     account_type VARCHAR(50) NOT NULL CHECK (account_type IN ('asset', 'liability', 'equity', 'revenue', 'expense')),
     description TEXT,
@@ -21,7 +25,7 @@ CREATE TABLE logical_accounts (
 -- Ledger Transactions Table
 -- Stores all financial transactions in the ledger
 CREATE TABLE ledger_transactions (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     transaction_date TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
     account_id UUID NOT NULL REFERENCES logical_accounts(id),
     amount DECIMAL(20, 8) NOT NULL,
@@ -37,7 +41,7 @@ CREATE TABLE ledger_transactions (
 -- Allocation Rules Table
 -- Stores rules for automatic fund allocation across accounts
 CREATE TABLE allocation_rules (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     rule_name VARCHAR(255) NOT NULL UNIQUE,
     source_account_id UUID NOT NULL REFERENCES logical_accounts(id),
     allocation_config JSONB NOT NULL,
@@ -52,7 +56,7 @@ CREATE TABLE allocation_rules (
 -- Audit Log Table
 -- Tracks all changes and actions in the ledger system
 CREATE TABLE audit_log (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     entity_type VARCHAR(100) NOT NULL,
     entity_id UUID NOT NULL,
     action VARCHAR(50) NOT NULL CHECK (action IN ('create', 'update', 'delete', 'read')),
@@ -66,7 +70,7 @@ CREATE TABLE audit_log (
 -- Reconciliation Log Table
 -- Tracks reconciliation activities for accounts
 CREATE TABLE reconciliation_log (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     account_id UUID NOT NULL REFERENCES logical_accounts(id),
     reconciliation_date TIMESTAMP WITH TIME ZONE NOT NULL,
     expected_balance DECIMAL(20, 8) NOT NULL,
@@ -80,7 +84,7 @@ CREATE TABLE reconciliation_log (
 );
 
 -- Create indexes for performance
-CREATE INDEX idx_ledger_transactions_account_id ON ledger_transactions(account_id);
+CREATE INDEX idx_ledger_transactions_account_id ON ledger_transactions(account_id) INCLUDE (amount, currency, transaction_type);
 CREATE INDEX idx_ledger_transactions_transaction_date ON ledger_transactions(transaction_date);
 CREATE INDEX idx_ledger_transactions_reference_id ON ledger_transactions(reference_id);
 CREATE INDEX idx_allocation_rules_source_account_id ON allocation_rules(source_account_id);
@@ -90,27 +94,8 @@ CREATE INDEX idx_audit_log_timestamp ON audit_log(timestamp);
 CREATE INDEX idx_reconciliation_log_account_id ON reconciliation_log(account_id);
 CREATE INDEX idx_reconciliation_log_status ON reconciliation_log(status);
 
--- Create updated_at trigger function
-CREATE OR REPLACE FUNCTION update_updated_at_column()
-RETURNS TRIGGER AS $$
-BEGIN
-    NEW.updated_at = NOW();
-    RETURN NEW;
-END;
-$$ LANGUAGE plpgsql;
-
--- Apply updated_at triggers
-CREATE TRIGGER update_logical_accounts_updated_at
-    BEFORE UPDATE ON logical_accounts
-    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
-
-CREATE TRIGGER update_ledger_transactions_updated_at
-    BEFORE UPDATE ON ledger_transactions
-    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
-
-CREATE TRIGGER update_allocation_rules_updated_at
-    BEFORE UPDATE ON allocation_rules
-    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+-- updated_at is set by the application's ORM (onupdate=now()) as part of
+-- each UPDATE statement, so no per-row trigger is installed.
 
 -- Grant permissions (adjust as needed for your environment)
 -- GRANT SELECT, INSERT, UPDATE ON ALL TABLES IN SCHEMA public TO ledger_api_user;
@@ -2,9 +2,22 @@
 Configuration module for Ledger API.
 Loads settings from environment variables.
 """
+from pydantic import Field, PrivateAttr
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List
+from functools import lru_cache
+from typing import Any, Tuple
 import os
+import sys
+
+# Secrets rejected for JWT_SECRET_KEY regardless of length
+_WEAK_SECRETS = frozenset({
+    "your-secret-key-change-in-production",
+    "CHANGE_ME",
+    "secret",
+    "password",
+    "123456",
+    "",
+})
 
 
 class Settings(BaseSettings):
@@ -26,38 +39,54 @@ class Settings(BaseSettings):
     # Binding to 0.0.0.0 is intentional for containerized deployment (Docker/Railway)
     HOST: str = "0.0.0.0"  # nosec B104
     PORT: int = 8001
+    # Gunicorn worker processes (see gunicorn.conf.py); each holds its own DB pool
+    WORKERS: int = Field(default_factory=lambda: 2 * (os.cpu_count() or 1) + 1)
     
     # Logging
     LOG_LEVEL: str = "INFO"
     
+    # Audit log writer: rows per INSERT and max wait to fill a batch
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_MS: int = 100
+    
+    # Parsed form of ALLOW_ORIGINS, filled in by model_post_init
+    _cors_origins: Tuple[str, ...] = PrivateAttr(default=())
+    
     model_config = SettingsConfigDict(
         env_file=".env",
+        env_file_encoding="utf-8",
         case_sensitive=True,
+        frozen=True,
         extra="ignore"
     )
     
+    def model_post_init(self, __context: Any) -> None:
+        """Parse comma-separated settings once, at construction time."""
+        # Blank entries (e.g. a trailing comma) are dropped
+        self._cors_origins = tuple(
+            sys.intern(origin) for origin in map(str.strip, self.ALLOW_ORIGINS.split(",")) if origin
+        )
+    
     def __init__(self, **values):
         super().__init__(**values)
         # Validate JWT_SECRET_KEY is not using insecure default
-        weak_secrets = [
-            "your-secret-key-change-in-production", 
-            "CHANGE_ME", 
-            "secret", 
-            "password", 
-            "123456",
-            ""
-        ]
-        if self.JWT_SECRET_KEY in weak_secrets or len(self.JWT_SECRET_KEY) < 32:
+        if self.JWT_SECRET_KEY in _WEAK_SECRETS or len(self.JWT_SECRET_KEY) < 32:
             raise ValueError(
                 "JWT_SECRET_KEY must be at least 32 characters long and not a common weak value. "
                 "Generate a strong secret using: openssl rand -hex 32"
             )
     
     @property
-    def cors_origins(self) -> List[str]:
-        """Parse ALLOW_ORIGINS into a list."""
-        return [origin.strip() for origin in self.ALLOW_ORIGINS.split(",")]
+    def cors_origins(self) -> Tuple[str, ...]:
+        """ALLOW_ORIGINS as a tuple of origins."""
+        return self._cors_origins
 
 
-# Global settings instance
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Return the process-wide settings instance.
+    The environment and .env file are parsed once; later calls hit the cache.
+    Can be used directly or as a FastAPI dependency (Depends(get_settings)).
+    """
+    return Settings()
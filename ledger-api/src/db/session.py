@@ -3,30 +3,125 @@ Database session management for Ledger API.
 Provides SQLAlchemy engine and session factory.
 """
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
-from src.config import settings
+from sqlalchemy.pool import StaticPool
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Generator
+from uuid import UUID
+import json
+import re
+import orjson
+from src.config import get_settings
 
-# Create SQLAlchemy engine
-# SQLite doesn't support pool_size and max_overflow
-if settings.DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(
+
+def _json_default(obj: Any) -> Any:
+    """Encode the non-native types stored in JSON columns."""
+    if isinstance(obj, (Decimal, UUID)):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+
+
+def _json_serializer(value: Any) -> str:
+    """
+    Serialise JSON column values (JSONB binds, SQLite TEXT) with orjson.
+    Non-string keys are stringified as json.dumps would; values orjson
+    refuses, such as integers wider than 64 bits, fall back to json.dumps.
+    """
+    try:
+        return orjson.dumps(value, default=_json_default, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    except orjson.JSONEncodeError:
+        return json.dumps(value, default=_json_default)
+
+
+# orjson parses integers of 2**64 and above as floats; any such number has
+# at least 20 digits, so documents containing a run that long are read with
+# json.loads, which keeps them exact
+_LONG_DIGIT_RUN = re.compile(r"\d{20}")
+
+
+def _json_deserializer(value: Any) -> Any:
+    """Parse JSON column values with orjson, losslessly for oversized integers."""
+    if _LONG_DIGIT_RUN.search(value if isinstance(value, str) else value.decode("utf-8")):
+        return json.loads(value)
+    return orjson.loads(value)
+
+
+@lru_cache(maxsize=1)
+def get_engine() -> Engine:
+    """
+    Return the process-wide SQLAlchemy engine.
+    Built on first use so importing this module (models, Alembic, tests)
+    does not load the driver or set up a pool.
+    """
+    settings = get_settings()
+    
+    # SQLite doesn't support pool_size and max_overflow
+    if settings.DATABASE_URL.startswith("sqlite"):
+        # An in-memory database lives and dies with its connection, so share one
+        in_memory = ":memory:" in settings.DATABASE_URL or settings.DATABASE_URL == "sqlite://"
+        return create_engine(
+            settings.DATABASE_URL,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool if in_memory else None,
+            echo=False
+        )
+    
+    # LIFO checkout keeps the most recently used connections warm and lets
+    # surplus ones idle out; recycle replaces connections before the server
+    # or an intermediate proxy drops them. Multi-row INSERTs already go out
+    # as batched VALUES (insertmanyvalues); values_plus_batch also pages
+    # executemany UPDATE/DELETE through psycopg2's execute_batch.
+    return create_engine(
         settings.DATABASE_URL,
-        connect_args={"check_same_thread": False},
+        pool_pre_ping=True,
+        pool_size=10,
+        max_overflow=20,
+        pool_recycle=1800,
+        pool_use_lifo=True,
+        pool_reset_on_return="rollback",
+        executemany_mode="values_plus_batch",
+        insertmanyvalues_page_size=1000,
+        json_serializer=_json_serializer,
+        json_deserializer=_json_deserializer,
         echo=False
     )
-else:
-    engine = create_engine(
+
+
+@lru_cache(maxsize=1)
+def get_audit_engine() -> Engine:
+    """
+    Return the engine used by the background audit writer.
+    Postgres gets a separate single-connection pool so audit batches never
+    compete with request handlers for connections; SQLite shares the main
+    engine (an in-memory database only exists on that engine's connection).
+    """
+    settings = get_settings()
+    
+    if settings.DATABASE_URL.startswith("sqlite"):
+        return get_engine()
+    
+    # One writer thread needs exactly one connection; pre-ping costs one
+    # round-trip per batch rather than per row
+    return create_engine(
         settings.DATABASE_URL,
         pool_pre_ping=True,
-        pool_size=10,
-        max_overflow=20,
+        pool_size=1,
+        max_overflow=0,
+        pool_recycle=1800,
+        json_serializer=_json_serializer,
+        json_deserializer=_json_deserializer,
         echo=False
     )
 
-# Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@lru_cache(maxsize=1)
+def get_sessionmaker() -> sessionmaker:
+    """Return the session factory bound to the shared engine."""
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+
 
 # Create Base class for models
 Base = declarative_base()
@@ -42,11 +137,9 @@ def get_db() -> Generator[Session, None, None]:
         def read_items(database_session: Session = Depends(get_db)):
             return database_session.query(Item).all()
     """
-    database_session = SessionLocal()
-    try:
+    # The Session context manager closes it, rolling back any open transaction
+    with get_sessionmaker()() as database_session:
         yield database_session
-    finally:
-        database_session.close()
 
 
 def init_db():
@@ -55,4 +148,4 @@ def init_db():
     Creates all tables defined in models.
     """
     from src.models import models  # Import here to avoid circular imports
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
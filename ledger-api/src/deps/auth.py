@@ -3,14 +3,79 @@ JWT authentication dependencies for protected endpoints.
 """
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError, jwt
+import jwt
+import orjson
+import base64
+import calendar
+import hashlib
+import hmac
 from datetime import datetime, timedelta
-from typing import Optional
-from src.config import settings
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, Optional, Tuple
+import time
+from src.config import get_settings
 
 # Security scheme
 security = HTTPBearer()
 
+# Shared failure details; each raise builds a fresh exception so no
+# traceback or context is carried over between requests
+_UNAUTH_DETAIL = "Could not validate credentials"
+_UNAUTH_HEADERS = {"WWW-Authenticate": "Bearer"}
+_FORBIDDEN_ADMIN_DETAIL = "Admin access required"
+_FORBIDDEN_DETAIL = "Insufficient permissions"
+
+
+def _unauthorized() -> HTTPException:
+    """A new 401 response asking for bearer credentials."""
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=_UNAUTH_DETAIL,
+        headers=_UNAUTH_HEADERS,
+    )
+
+
+# Claims every accepted token must carry
+_DECODE_OPTIONS = {"require": ["exp", "sub"]}
+
+# Registered claims that hold a NumericDate besides exp
+_TIME_CLAIMS = ("iat", "nbf")
+
+
+@lru_cache(maxsize=1)
+def _jwt_config() -> Tuple[bytes, Tuple[str, ...], int]:
+    """
+    Signing key bytes, accepted algorithms and default token lifetime in
+    seconds, read from settings once. The token paths then work on plain
+    locals instead of re-reading settings attributes on every call.
+    """
+    settings = get_settings()
+    return (
+        settings.JWT_SECRET_KEY.encode("utf-8"),
+        (settings.JWT_ALGORITHM,),
+        settings.JWT_EXPIRATION_MINUTES * 60,
+    )
+
+
+# HMAC algorithms whose signing is done inline; anything else goes via PyJWT
+_HMAC_DIGESTS = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+
+
+def _b64url(data: bytes) -> bytes:
+    """Unpadded base64url encoding, as used by JWS."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+@lru_cache(maxsize=None)
+def _jws_header(algorithm: str) -> bytes:
+    """Encoded JWS header for an algorithm; constant, so built once."""
+    return _b64url(orjson.dumps({"alg": algorithm, "typ": "JWT"}))
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
@@ -23,24 +88,56 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     Returns:
         Encoded JWT token
     """
+    key, algorithms, lifetime = _jwt_config()
     to_encode = data.copy()
     
+    # exp is seconds since the epoch; plain integer math avoids datetime objects
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.JWT_EXPIRATION_MINUTES)
-    
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(
-        to_encode, 
-        settings.JWT_SECRET_KEY, 
-        algorithm=settings.JWT_ALGORITHM
-    )
+        lifetime = int(expires_delta.total_seconds())
+    
+    to_encode["exp"] = int(time.time()) + lifetime
+    # Other time claims become NumericDate as PyJWT would encode them
+    for claim in _TIME_CLAIMS:
+        value = to_encode.get(claim)
+        if isinstance(value, datetime):
+            # timegm reads naive values as UTC, matching PyJWT
+            to_encode[claim] = calendar.timegm(value.utctimetuple())
+    algorithm = algorithms[0]
+    payload = orjson.dumps(to_encode)
     
-    return encoded_jwt
+    digest = _HMAC_DIGESTS.get(algorithm)
+    if digest is None:
+        # Hand PyJWT the serialised claims for non-HMAC algorithms
+        return jwt.api_jws.encode(payload, key, algorithm=algorithm)
+    
+    # header.payload.signature, with the header precomputed per algorithm
+    signing_input = _jws_header(algorithm) + b"." + _b64url(payload)
+    signature = hmac.new(key, signing_input, digest).digest()
+    encoded_jwt = signing_input + b"." + _b64url(signature)
+    
+    return encoded_jwt.decode("ascii")
+
+
+@lru_cache(maxsize=4096)
+def _decode_raw(token: str) -> Mapping[str, Any]:
+    """
+    Verify a token's signature and decode its claims.
+    Results are memoised per raw token so a client reusing the same bearer
+    token pays for HMAC verification and JSON parsing once; failures raise
+    and are therefore never cached. The claims are returned read-only since
+    every request presenting the token shares the same object.
+    """
+    key, algorithms, _ = _jwt_config()
+    # jwt.decode validates the signature and expiration in one call
+    return MappingProxyType(jwt.decode(
+        token,
+        key,
+        algorithms=algorithms,
+        options=_DECODE_OPTIONS
+    ))
 
 
-def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Mapping[str, Any]:
     """
     Verify JWT token and return decoded payload.
     
@@ -48,34 +145,25 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security))
         credentials: HTTP authorization credentials
         
     Returns:
-        Decoded token payload
+        Decoded token payload (read-only)
         
     Raises:
         HTTPException: If token is invalid or expired
     """
-    token = credentials.credentials
+    try:
+        payload = _decode_raw(credentials.credentials)
+    except jwt.InvalidTokenError:
+        raise _unauthorized() from None
     
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+    # A cached payload was only checked for expiry on first decode
+    exp = payload.get("exp")
+    if exp is not None and exp < time.time():
+        raise _unauthorized()
     
-    try:
-        # jwt.decode automatically validates expiration
-        payload = jwt.decode(
-            token, 
-            settings.JWT_SECRET_KEY, 
-            algorithms=[settings.JWT_ALGORITHM]
-        )
-        
-        return payload
-        
-    except JWTError:
-        raise credentials_exception
+    return payload
 
 
-def get_current_user(token_payload: dict = Depends(verify_token)) -> str:
+def get_current_user(token_payload: Mapping[str, Any] = Depends(verify_token)) -> str:
     """
     Get current user from token payload.
     
@@ -91,15 +179,12 @@ def get_current_user(token_payload: dict = Depends(verify_token)) -> str:
     user_id = token_payload.get("sub")
     
     if user_id is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials"
-        )
+        raise _unauthorized()
     
     return user_id
 
 
-def require_admin(token_payload: dict = Depends(verify_token)) -> str:
+def require_admin(token_payload: Mapping[str, Any] = Depends(verify_token)) -> str:
     """
     Require admin role for endpoint access.
     
@@ -116,15 +201,51 @@ def require_admin(token_payload: dict = Depends(verify_token)) -> str:
     role = token_payload.get("role")
     
     if user_id is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials"
-        )
+        raise _unauthorized()
     
     if role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin access required"
+            detail=_FORBIDDEN_ADMIN_DETAIL
         )
     
     return user_id
+
+
+def require_role(*required_roles: str) -> Callable[..., Mapping[str, Any]]:
+    """
+    Build a dependency that requires any one of the given roles.
+    
+    The token may carry a single "role" claim, a "roles" list, or both.
+    The accepted roles are frozen once here so each request is a set lookup.
+    
+    Args:
+        required_roles: Role names, any of which grants access
+        
+    Returns:
+        Dependency returning the decoded token payload
+        
+    Raises:
+        HTTPException: If the token holds none of the required roles
+    """
+    required = frozenset(required_roles)
+    
+    def role_checker(token_payload: Mapping[str, Any] = Depends(verify_token)) -> Mapping[str, Any]:
+        role = token_payload.get("role")
+        roles = token_payload.get("roles", ())
+        # Claims come from the token as arbitrary JSON: only a string role and
+        # a list of string roles are considered, anything else grants nothing
+        if not isinstance(role, str):
+            role = None
+        if not isinstance(roles, (list, tuple)) or not all(isinstance(name, str) for name in roles):
+            roles = ()
+        
+        if role not in required and required.isdisjoint(roles):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=_FORBIDDEN_DETAIL
+            )
+        
+        return token_payload
+    
+    return role_checker
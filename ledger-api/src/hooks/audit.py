@@ -2,15 +2,261 @@
 Audit logging hooks for tracking all system changes.
 """
 from fastapi import Request
-from sqlalchemy.orm import Session
-from typing import Optional, Dict, Any
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, sessionmaker
+from datetime import datetime, timezone
+from typing import Callable, Optional, Dict, Any, List, Tuple
 from uuid import UUID
+import io
+import logging
+import queue
+import sys
+import threading
+import time
+from src.config import get_settings
+from src.db.session import _json_deserializer, _json_serializer, get_audit_engine
 from src.models.models import AuditLog
 
+logger = logging.getLogger(__name__)
+
+# Queue sentinel telling the writer thread to flush and exit
+_STOP = object()
+
+# Batch write attempts before falling back to row-by-row inserts, and the
+# initial delay in seconds between them (doubled after each failure)
+_WRITE_ATTEMPTS = 3
+_RETRY_DELAY = 0.05
+
+# Actions permitted by the audit_log check_action_type constraint
+_ALLOWED_ACTIONS = frozenset({"create", "update", "delete", "read"})
+
+
+# Column order of the rows streamed by _copy_batch; id is left to the
+# column's gen_random_uuid() server default
+_COPY_COLUMNS = (
+    "entity_type", "entity_id", "action", "user_id",
+    "changes", "ip_address", "user_agent", "timestamp",
+)
+_COPY_SQL = f"COPY audit_log ({', '.join(_COPY_COLUMNS)}) FROM STDIN"
+
+
+def _copy_field(value: Any) -> str:
+    """Render one value in COPY text format: \\N for NULL, control chars escaped."""
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _copy_row(entry: Dict[str, Any]) -> str:
+    """
+    Render a queued audit entry as one COPY text-format line.
+    changes is encoded with the engine's orjson JSONB serializer, so COPY
+    and INSERT store identical documents.
+    """
+    changes = entry["changes"]
+    return "\t".join((
+        _copy_field(entry["entity_type"]),
+        _copy_field(entry["entity_id"]),
+        _copy_field(entry["action"]),
+        _copy_field(entry["user_id"]),
+        _copy_field(None if changes is None else _json_serializer(changes)),
+        _copy_field(entry["ip_address"]),
+        _copy_field(entry["user_agent"]),
+        _copy_field(entry["timestamp"].isoformat()),
+    )) + "\n"
+
+
+def _copy_batch(session: Session, batch: List[Dict[str, Any]]) -> None:
+    """
+    Stream a batch into audit_log with COPY FROM STDIN (psycopg2).
+    COPY skips per-row statement parsing, so it outpaces even multi-row
+    INSERTs for the writer's bulk loads.
+    """
+    buffer = io.StringIO("".join(map(_copy_row, batch)))
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(_COPY_SQL, buffer)
+    finally:
+        cursor.close()
+
+
+def _request_context(request: Request) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Client IP address and user agent for a request.
+    Read once and kept on request.state, so routes that log several
+    entries per request do not re-walk the client and headers each time.
+    """
+    context = getattr(request.state, "audit_context", None)
+    if context is None:
+        client = request.client
+        context = (client.host if client else None, request.headers.get("user-agent"))
+        request.state.audit_context = context
+    return context
+
+
+class AuditWriter:
+    """
+    Background writer that persists audit entries off the request path.
+    
+    Entries are queued by AuditLogger and inserted by a single daemon thread
+    in batches of up to AUDIT_BATCH_SIZE rows, collected over at most
+    AUDIT_FLUSH_MS, each written in one transaction: streamed with COPY on
+    psycopg2 connections, a multi-row INSERT on any other driver.
+    Started and stopped by the application lifespan.
+    """
+    
+    __slots__ = (
+        "_queue", "_batch_size", "_flush_interval",
+        "_session_factory", "_thread", "_accepting", "_lock",
+    )
+    
+    def __init__(self, max_queue_size: int = 10000):
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._batch_size = 1
+        self._flush_interval = 0.0
+        self._session_factory: Optional[Callable[[], Session]] = None
+        self._thread: Optional[threading.Thread] = None
+        self._accepting = False
+        # Makes the accepting check and the enqueue in submit atomic with
+        # respect to stop, so no entry can land behind the stop sentinel
+        self._lock = threading.Lock()
+    
+    def start(self, session_factory: Optional[Callable[[], Session]] = None) -> None:
+        """
+        Start the writer thread.
+        
+        Args:
+            session_factory: Optional session factory; defaults to one bound
+                to the dedicated audit engine
+        """
+        if self._thread is not None:
+            return
+        
+        settings = get_settings()
+        self._batch_size = settings.AUDIT_BATCH_SIZE
+        self._flush_interval = settings.AUDIT_FLUSH_MS / 1000
+        self._session_factory = session_factory or sessionmaker(bind=get_audit_engine())
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+        with self._lock:
+            self._accepting = True
+    
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop accepting entries, flush everything queued and join the thread."""
+        if self._thread is None:
+            return
+        
+        with self._lock:
+            self._accepting = False
+        # Every accepted entry is already queued, ahead of the sentinel
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+    
+    def submit(self, entry: Dict[str, Any]) -> bool:
+        """
+        Queue an audit row for writing.
+        
+        Returns:
+            False if the writer is not running or the queue is full, in which
+            case the caller should write the entry itself
+        """
+        with self._lock:
+            if not self._accepting:
+                return False
+            
+            try:
+                self._queue.put_nowait(entry)
+            except queue.Full:
+                return False
+        
+        return True
+    
+    def _run(self) -> None:
+        """
+        Writer loop: block for one entry, then keep collecting until the
+        batch is full or the flush interval since that entry has passed.
+        """
+        while True:
+            batch: List[Dict[str, Any]] = []
+            entry = self._queue.get()
+            deadline = time.monotonic() + self._flush_interval
+            
+            while entry is not _STOP:
+                batch.append(entry)
+                if len(batch) >= self._batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        entry = self._queue.get(timeout=remaining)
+                    else:
+                        entry = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            
+            if batch:
+                self._write(batch)
+            
+            if entry is _STOP:
+                return
+    
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        """
+        Persist a batch of audit rows.
+        
+        The batch is retried with backoff to ride out transient database
+        errors. If it still fails, the rows are inserted one at a time so a
+        single bad row cannot take the rest of the batch with it.
+        """
+        for attempt in range(_WRITE_ATTEMPTS):
+            try:
+                self._write_batch(batch)
+                return
+            except Exception:
+                logger.warning(
+                    "Audit batch of %d entries failed (attempt %d of %d)",
+                    len(batch), attempt + 1, _WRITE_ATTEMPTS, exc_info=True
+                )
+                if attempt + 1 < _WRITE_ATTEMPTS:
+                    time.sleep(_RETRY_DELAY * 2 ** attempt)
+        
+        for entry in batch:
+            try:
+                with self._session_factory() as session:
+                    session.execute(insert(AuditLog), [entry])
+                    session.commit()
+            except Exception:
+                # Last resort: keep the row in the error log so it can be replayed
+                logger.exception("Dropping audit log entry that could not be written: %r", entry)
+    
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """Insert a batch of audit rows in a single transaction."""
+        with self._session_factory() as session:
+            # copy_expert is psycopg2's API; other Postgres drivers insert
+            if session.get_bind().dialect.driver == "psycopg2":
+                _copy_batch(session, batch)
+            else:
+                session.execute(insert(AuditLog), batch)
+            session.commit()
+
+
+# Process-wide writer used by AuditLogger
+audit_writer = AuditWriter()
+
 
 class AuditLogger:
     """Helper class for creating audit log entries."""
     
+    # Namespace for static helpers; never carries instance state
+    __slots__ = ()
+    
     @staticmethod
     def log_action(
         db: Session,
@@ -20,10 +266,13 @@ class AuditLogger:
         user_id: Optional[str] = None,
         changes: Optional[Dict[str, Any]] = None,
         request: Optional[Request] = None
-    ) -> AuditLog:
+    ) -> Optional[AuditLog]:
         """
         Create an audit log entry.
         
+        The entry is handed to the background audit writer when it is
+        running; otherwise (or if its queue is full) it is written inline.
+        
         Args:
             db: Database session
             entity_type: Type of entity (e.g., 'LogicalAccount', 'LedgerTransaction')
@@ -34,28 +283,40 @@ class AuditLogger:
             request: Optional FastAPI request object for IP and user agent
             
         Returns:
-            Created audit log entry
+            Created audit log entry, or None if it was queued for writing
+            
+        Raises:
+            ValueError: If action is not one of the allowed audit actions
         """
-        ip_address = None
-        user_agent = None
+        # Reject typos before they reach the queue and fail the whole batch
+        if action not in _ALLOWED_ACTIONS:
+            raise ValueError(f"Invalid audit action: {action!r}")
         
-        if request:
-            # Get client IP address
-            if hasattr(request, 'client') and request.client:
-                ip_address = request.client.host
-            
-            # Get user agent
-            user_agent = request.headers.get('user-agent')
+        ip_address, user_agent = _request_context(request) if request else (None, None)
         
-        audit_entry = AuditLog(
-            entity_type=entity_type,
-            entity_id=entity_id,
-            action=action,
-            user_id=user_id,
-            changes=changes,
-            ip_address=ip_address,
-            user_agent=user_agent
-        )
+        # Snapshot changes exactly as they will be stored: the row may be
+        # written after the caller has moved on and mutated its dict, and an
+        # unserialisable value fails here rather than in the writer's batch
+        if changes is not None:
+            changes = _json_deserializer(_json_serializer(changes))
+        
+        # Queued rows share one copy of these highly repetitive strings
+        entry = {
+            "entity_type": sys.intern(entity_type),
+            "entity_id": entity_id,
+            "action": sys.intern(action),
+            "user_id": user_id,
+            "changes": changes,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            # Stamped now rather than by the server default at write time
+            "timestamp": datetime.now(timezone.utc),
+        }
+        
+        if audit_writer.submit(entry):
+            return None
+        
+        audit_entry = AuditLog(**entry)
         
         db.add(audit_entry)
         db.commit()
@@ -71,7 +332,7 @@ class AuditLogger:
         entity_data: Dict[str, Any],
         user_id: Optional[str] = None,
         request: Optional[Request] = None
-    ) -> AuditLog:
+    ) -> Optional[AuditLog]:
         """Log entity creation."""
         return AuditLogger.log_action(
             db=db,
@@ -92,7 +353,7 @@ class AuditLogger:
         new_data: Dict[str, Any],
         user_id: Optional[str] = None,
         request: Optional[Request] = None
-    ) -> AuditLog:
+    ) -> Optional[AuditLog]:
         """Log entity update."""
         changes = {
             "old": old_data,
@@ -117,7 +378,7 @@ class AuditLogger:
         entity_data: Dict[str, Any],
         user_id: Optional[str] = None,
         request: Optional[Request] = None
-    ) -> AuditLog:
+    ) -> Optional[AuditLog]:
         """Log entity deletion."""
         return AuditLogger.log_action(
             db=db,
@@ -136,7 +397,7 @@ class AuditLogger:
         entity_id: UUID,
         user_id: Optional[str] = None,
         request: Optional[Request] = None
-    ) -> AuditLog:
+    ) -> Optional[AuditLog]:
         """Log entity read access (for sensitive data)."""
         return AuditLogger.log_action(
             db=db,
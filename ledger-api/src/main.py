@@ -1,18 +1,85 @@
 """
 Main FastAPI application for Ledger API.
 """
-from fastapi import FastAPI
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+import orjson
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from src.config import settings
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from src.config import get_settings
+from src.db.session import get_audit_engine, get_engine
+from src.hooks.audit import audit_writer
+from src.middleware.metrics import PrometheusMiddleware, render_metrics, track_pool
 from src.routes import transactions, treasury, allocation_rules, workflow_patches
 
+settings = get_settings()
+
+
+def _orjson_default(obj: Any) -> Any:
+    """
+    Encode types orjson lacks; Decimal as a string to keep full precision.
+    UUID and datetime are only seen here on the json.dumps fallback.
+    """
+    if isinstance(obj, (Decimal, UUID)):
+        return str(obj)
+    if isinstance(obj, (date, datetime)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+
+
+class LedgerJSONResponse(ORJSONResponse):
+    """
+    ORJSONResponse that also handles the ledger's Decimal amounts.
+    UUID and datetime values are serialised natively by orjson.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        try:
+            return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            # orjson refuses integers wider than 64 bits, which JSON columns
+            # accept; json.dumps renders them exactly
+            return json.dumps(
+                content, default=_orjson_default, ensure_ascii=False, separators=(",", ":")
+            ).encode("utf-8")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Own the connection pools and the background audit writer for the
+    lifetime of the app.
+    """
+    # Build the engines up front so a bad DATABASE_URL fails at startup
+    # rather than on the first request
+    engines = (get_engine(), get_audit_engine())
+    track_pool("main", engines[0])
+    track_pool("audit", engines[1])
+    audit_writer.start()
+    yield
+    # Flushing and closing connections may wait on the database, so keep
+    # them off the event loop
+    await asyncio.to_thread(audit_writer.stop)
+    for engine in set(engines):
+        await asyncio.to_thread(engine.dispose)
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Ledger API",
     description="Single source of truth ledger for logical accounts, transactions, and allocation rules",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=LedgerJSONResponse,
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -20,10 +87,18 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Only what the API uses: preflights are a set lookup instead of a wildcard echo
+    allow_methods=("GET", "POST", "PUT", "PATCH", "DELETE"),
+    allow_headers=("Authorization", "Content-Type"),
 )
 
+# Compress larger responses (transaction and audit listings); small bodies
+# such as /health go out as-is
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Added last so it is outermost and the timings include the other middleware
+app.add_middleware(PrometheusMiddleware)
+
 # Include routers
 app.include_router(transactions.router, prefix=settings.API_V1_PREFIX)
 app.include_router(treasury.router, prefix=settings.API_V1_PREFIX)
@@ -31,23 +106,34 @@ app.include_router(allocation_rules.router, prefix=settings.API_V1_PREFIX)
 app.include_router(workflow_patches.router, prefix=settings.API_V1_PREFIX)
 
 
+# Static payloads, serialised once; the handlers only wrap the bytes
+_ROOT_BODY = orjson.dumps({
+    "message": "Ledger API",
+    "version": "1.0.0",
+    "docs": "/docs"
+})
+_HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "service": "ledger-api"
+})
+
+
 @app.get("/")
-def root():
+async def root():
     """Root endpoint."""
-    return {
-        "message": "Ledger API",
-        "version": "1.0.0",
-        "docs": "/docs"
-    }
+    return Response(_ROOT_BODY, media_type="application/json")
 
 
 @app.get("/health")
-def health_check():
+async def health_check():
     """Health check endpoint."""
-    return {
-        "status": "healthy",
-        "service": "ledger-api"
-    }
+    return Response(_HEALTH_BODY, media_type="application/json")
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint. Expose it to the internal network only."""
+    return render_metrics()
 
 
 if __name__ == "__main__":
@@ -56,5 +142,9 @@ if __name__ == "__main__":
         "src.main:app",
         host=settings.HOST,
         port=settings.PORT,
+        # uvloop does not install on Windows, so development uses whichever
+        # loop is available; production pins it in src.workers
+        loop="auto",
+        http="httptools",
         reload=True
     )
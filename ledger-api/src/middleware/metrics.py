@@ -0,0 +1,109 @@
+"""
+Prometheus request timing and connection pool metrics.
+"""
+import os
+import time
+from typing import Dict
+from fastapi import Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Gauge, Histogram,
+    generate_latest, multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+REQUEST_DURATION = Histogram(
+    "request_duration_seconds",
+    "Time spent handling HTTP requests",
+    ("route", "method", "code"),
+)
+DB_POOL_IN_USE = Gauge(
+    "db_pool_in_use",
+    "Database connections currently checked out of the pool",
+    ("pool",),
+    # Summed over the live Gunicorn workers in multiprocess mode
+    multiprocess_mode="livesum",
+)
+
+# Engines already reporting to DB_POOL_IN_USE, by pool label; the lifespan
+# may run more than once per process (tests), listeners must not stack
+_tracked_pools: Dict[str, Engine] = {}
+
+# Requests that match no route share one label so probes for random paths
+# cannot grow the series count without bound
+_UNMATCHED_ROUTE = "unmatched"
+
+
+class PrometheusMiddleware:
+    """
+    Pure ASGI middleware that times each HTTP request.
+    
+    Requests are labelled with the route template (``/api/v1/transactions/{transaction_id}``)
+    rather than the raw path to keep label cardinality bounded.
+    """
+    
+    __slots__ = ("app",)
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        status_code = 500
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router records the matched route on the shared scope
+            route = scope.get("route")
+            REQUEST_DURATION.labels(
+                getattr(route, "path", _UNMATCHED_ROUTE),
+                scope["method"],
+                str(status_code),
+            ).observe(time.perf_counter() - start)
+
+
+def track_pool(name: str, engine: Engine) -> None:
+    """
+    Count the engine's checked-out connections.
+    
+    Kept current from pool checkout/checkin events rather than sampled at
+    scrape time: in multiprocess mode a scrape only reads the values the
+    workers have stored, so a callback-backed gauge would never update.
+    """
+    if _tracked_pools.get(name) is engine:
+        return
+    _tracked_pools[name] = engine
+    gauge = DB_POOL_IN_USE.labels(name)
+    
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        gauge.inc()
+    
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        gauge.dec()
+
+
+def render_metrics() -> Response:
+    """
+    Render the current metrics in the Prometheus text format.
+    Under Gunicorn (PROMETHEUS_MULTIPROC_DIR set) the values of every worker
+    are aggregated, so a scrape sees the same totals whichever worker answers.
+    """
+    registry = REGISTRY
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
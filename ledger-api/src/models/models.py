@@ -3,17 +3,15 @@ SQLAlchemy models for Ledger API.
 Defines database tables and relationships.
 """
 from sqlalchemy import (
-    Column, String, Text, Boolean, DECIMAL, 
+    Column, String, Text, Boolean, DECIMAL, Enum,
     ForeignKey, CheckConstraint, Index, TIMESTAMP, Computed, TypeDecorator
 )
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB as PG_JSONB, INET
 from sqlalchemy.types import CHAR, TEXT
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from sqlalchemy.orm import relationship
 import uuid as uuid_lib
-import json
-from decimal import Decimal
-from src.db.session import Base
+from src.db.session import Base, _json_deserializer, _json_serializer
 
 
 
@@ -35,7 +33,8 @@ class GUID(TypeDecorator):
         if value is None:
             return value
         elif dialect.name == 'postgresql':
-            return str(value) if isinstance(value, uuid_lib.UUID) else value
+            # psycopg2 adapts uuid.UUID natively; no string round-trip
+            return value
         else:
             if isinstance(value, uuid_lib.UUID):
                 return str(value)
@@ -70,8 +69,8 @@ class JSON(TypeDecorator):
             return value
         else:
             if value is not None:
-                # Custom JSON encoder to handle UUID and Decimal
-                return json.dumps(value, default=self._json_serializer)
+                # Same orjson encoding as JSONB binds; Decimal via its default hook
+                return _json_serializer(value)
             return value
 
     def process_result_value(self, value, dialect):
@@ -79,17 +78,8 @@ class JSON(TypeDecorator):
             return value
         else:
             if value is not None:
-                return json.loads(value)
+                return _json_deserializer(value)
             return value
-    
-    @staticmethod
-    def _json_serializer(obj):
-        """Custom JSON serializer for objects not serializable by default."""
-        if isinstance(obj, uuid_lib.UUID):
-            return str(obj)
-        if isinstance(obj, Decimal):
-            return str(obj)
-        raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
 
 
 class LogicalAccount(Base):
@@ -100,7 +90,8 @@ class LogicalAccount(Base):
     account_name = Column(String(255), nullable=False, unique=True)
     account_type = Column(String(50), nullable=False)
     description = Column(Text)
-    custom_metadata = Column(JSON, default={})
+    # Attribute renamed because Declarative reserves "metadata"; the column keeps its name
+    custom_metadata = Column("metadata", JSON, default=dict)
     is_active = Column(Boolean, default=True)
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
     updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -130,7 +121,8 @@ class LedgerTransaction(Base):
     transaction_type = Column(String(50), nullable=False)
     reference_id = Column(String(255))
     description = Column(Text)
-    custom_metadata = Column(JSON, default={})
+    # Attribute renamed because Declarative reserves "metadata"; the column keeps its name
+    custom_metadata = Column("metadata", JSON, default=dict)
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
     updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
     
@@ -142,9 +134,15 @@ class LedgerTransaction(Base):
             "transaction_type IN ('debit', 'credit')",
             name="check_transaction_type"
         ),
-        Index("idx_ledger_transactions_account_id", "account_id"),
+        Index(
+            "idx_ledger_transactions_account_id_date", "account_id", "transaction_date",
+            postgresql_include=["amount", "currency", "transaction_type"]
+        ),
         Index("idx_ledger_transactions_transaction_date", "transaction_date"),
-        Index("idx_ledger_transactions_reference_id", "reference_id"),
+        Index(
+            "idx_ledger_transactions_reference_id", "reference_id",
+            postgresql_where=text("reference_id IS NOT NULL")
+        ),
     )
 
 
@@ -190,8 +188,13 @@ class AuditLog(Base):
             "action IN ('create', 'update', 'delete', 'read')",
             name="check_action_type"
         ),
-        Index("idx_audit_log_entity_type_id", "entity_type", "entity_id"),
-        Index("idx_audit_log_timestamp", "timestamp"),
+        Index("idx_audit_log_entity_type_id_timestamp", "entity_type", "entity_id", "timestamp"),
+        Index(
+            "idx_audit_log_timestamp",
+            "timestamp",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ),
     )
 
 
@@ -231,13 +234,24 @@ class WorkflowPatch(Base):
     id = Column(GUID(), primary_key=True, default=uuid_lib.uuid4)
     patch_name = Column(String(255), nullable=False)
     patch_version = Column(String(50), nullable=False)
-    patch_type = Column(String(50), nullable=False)
+    patch_type = Column(
+        Enum('bug_fix', 'performance', 'security', 'feature', 'refactor',
+             name='patch_type', create_constraint=True),
+        nullable=False
+    )
     description = Column(Text, nullable=False)
     target_workflow = Column(String(255), nullable=False)
     issue_identified = Column(Text, nullable=False)
     patch_content = Column(JSON, nullable=False)
-    status = Column(String(50), nullable=False, default='pending')
-    severity = Column(String(50), nullable=False)
+    status = Column(
+        Enum('pending', 'testing', 'tested', 'approved', 'deployed', 'failed', 'rolled_back',
+             name='patch_status', create_constraint=True),
+        nullable=False, default='pending'
+    )
+    severity = Column(
+        Enum('critical', 'high', 'medium', 'low', name='patch_severity', create_constraint=True),
+        nullable=False
+    )
     created_by = Column(String(255), default='WorkflowPatchAgent')
     reviewed_by = Column(String(255))
     approved_by = Column(String(255))
@@ -251,19 +265,10 @@ class WorkflowPatch(Base):
     rolled_back_at = Column(TIMESTAMP(timezone=True))
     
     __table_args__ = (
-        CheckConstraint(
-            "patch_type IN ('bug_fix', 'performance', 'security', 'feature', 'refactor')",
-            name="check_patch_type"
+        Index(
+            "idx_workflow_patches_status_active", "status",
+            postgresql_where=text("status IN ('pending', 'testing', 'tested', 'approved')")
         ),
-        CheckConstraint(
-            "status IN ('pending', 'testing', 'tested', 'approved', 'deployed', 'failed', 'rolled_back')",
-            name="check_patch_status"
-        ),
-        CheckConstraint(
-            "severity IN ('critical', 'high', 'medium', 'low')",
-            name="check_patch_severity"
-        ),
-        Index("idx_workflow_patches_status", "status"),
         Index("idx_workflow_patches_target_workflow", "target_workflow"),
         Index("idx_workflow_patches_created_at", "created_at"),
     )
@@ -275,30 +280,31 @@ class WorkflowAnalysis(Base):
     
     id = Column(GUID(), primary_key=True, default=uuid_lib.uuid4)
     workflow_name = Column(String(255), nullable=False)
-    analysis_type = Column(String(50), nullable=False)
+    analysis_type = Column(
+        Enum('security', 'performance', 'efficiency', 'compatibility', 'quality',
+             name='analysis_type', create_constraint=True),
+        nullable=False
+    )
     findings = Column(JSON, nullable=False)
     metrics = Column(JSON)
     recommendations = Column(JSON)
-    severity = Column(String(50), nullable=False)
-    status = Column(String(50), nullable=False, default='new')
+    severity = Column(
+        Enum('critical', 'high', 'medium', 'low', 'info', name='analysis_severity', create_constraint=True),
+        nullable=False
+    )
+    status = Column(
+        Enum('new', 'in_progress', 'addressed', 'ignored', name='analysis_status', create_constraint=True),
+        nullable=False, default='new'
+    )
     analyzed_by = Column(String(255), default='WorkflowPatchAgent')
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
     addressed_at = Column(TIMESTAMP(timezone=True))
     
     __table_args__ = (
-        CheckConstraint(
-            "analysis_type IN ('security', 'performance', 'efficiency', 'compatibility', 'quality')",
-            name="check_analysis_type"
-        ),
-        CheckConstraint(
-            "severity IN ('critical', 'high', 'medium', 'low', 'info')",
-            name="check_analysis_severity"
-        ),
-        CheckConstraint(
-            "status IN ('new', 'in_progress', 'addressed', 'ignored')",
-            name="check_analysis_status"
-        ),
         Index("idx_workflow_analysis_workflow_name", "workflow_name"),
-        Index("idx_workflow_analysis_status", "status"),
+        Index(
+            "idx_workflow_analysis_status_open", "status",
+            postgresql_where=text("status IN ('new', 'in_progress')")
+        ),
         Index("idx_workflow_analysis_severity", "severity"),
     )
@@ -200,18 +200,8 @@ def get_account_balance(
     if not account_record:
         raise HTTPException(status_code=404, detail="Account not found")
     
-    # Calculate balance
-    balance = ReconciliationService.calculate_account_balance(db, account_id)
-    
-    # Get last transaction date
-    from src.models.models import LedgerTransaction
-    last_transaction = db.query(LedgerTransaction).filter(
-        LedgerTransaction.account_id == account_id
-    ).order_by(LedgerTransaction.transaction_date.desc()).first()
-    
-    last_transaction_date = None
-    if last_transaction:
-        last_transaction_date = last_transaction.transaction_date
+    # Balance and last transaction date in a single aggregate
+    balance, last_transaction_date = ReconciliationService.get_balance_summary(db, account_id)
     
     return AccountBalanceResponse(
         account_id=account_id,
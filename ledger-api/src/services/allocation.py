@@ -64,12 +64,15 @@ class AllocationService:
         if not source_account:
             raise ValueError(f"Source account {rule_data.source_account_id} not found")
         
-        # Check if all destination accounts exist
+        # Check if all destination accounts exist, with one query for the set
+        destination_ids = {config.destination_account_id for config in rule_data.allocation_config}
+        existing_ids = {
+            account_id for (account_id,) in db.query(LogicalAccount.id).filter(
+                LogicalAccount.id.in_(destination_ids)
+            )
+        }
         for config in rule_data.allocation_config:
-            destination_account = db.query(LogicalAccount).filter(
-                LogicalAccount.id == config.destination_account_id
-            ).first()
-            if not destination_account:
+            if config.destination_account_id not in existing_ids:
                 raise ValueError(
                     f"Destination account {config.destination_account_id} not found"
                 )
@@ -201,8 +204,11 @@ class AllocationService:
         
         db.commit()
         
-        # Refresh all transactions
-        for transaction in transactions:
-            db.refresh(transaction)
+        # Reload the committed rows (server-side dates) in one query rather
+        # than one refresh per transaction; the loaded rows repopulate the
+        # expired instances in place
+        db.query(LedgerTransaction).filter(
+            LedgerTransaction.id.in_([transaction.id for transaction in transactions])
+        ).all()
         
         return transactions
@@ -2,7 +2,7 @@
 Reconciliation service for account balance verification and tracking.
 """
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Optional, Tuple
 from decimal import Decimal
 from uuid import UUID
 from datetime import datetime
@@ -43,6 +43,39 @@ class ReconciliationService:
         
         return result if result is not None else Decimal("0")
     
+    @staticmethod
+    def get_balance_summary(
+        db: Session,
+        account_id: UUID
+    ) -> Tuple[Decimal, Optional[datetime]]:
+        """
+        Get an account's balance and last transaction date in one query.
+        Both aggregates read only columns held by the covering
+        (account_id, transaction_date) index.
+        
+        Args:
+            db: Database session
+            account_id: UUID of the account
+            
+        Returns:
+            Tuple of (current balance, last transaction date or None)
+        """
+        from sqlalchemy import case, func
+        
+        balance, last_transaction_date = db.query(
+            func.sum(
+                case(
+                    (LedgerTransaction.transaction_type == 'credit', LedgerTransaction.amount),
+                    else_=-LedgerTransaction.amount
+                )
+            ),
+            func.max(LedgerTransaction.transaction_date)
+        ).filter(
+            LedgerTransaction.account_id == account_id
+        ).one()
+        
+        return (balance if balance is not None else Decimal("0")), last_transaction_date
+    
     @staticmethod
     def create_reconciliation(
         db: Session,
@@ -0,0 +1,15 @@
+"""
+Gunicorn worker classes for production deployments.
+"""
+from uvicorn.workers import UvicornWorker
+
+
+class LedgerUvicornWorker(UvicornWorker):
+    """
+    Uvicorn worker pinned to uvloop and httptools.
+    
+    The stock worker picks both with "auto" and silently falls back to
+    asyncio and h11; naming them makes a missing one fail at boot.
+    """
+    
+    CONFIG_KWARGS = {**UvicornWorker.CONFIG_KWARGS, "loop": "uvloop", "http": "httptools"}
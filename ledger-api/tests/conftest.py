@@ -0,0 +1,34 @@
+"""
+Shared test fixtures.
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.db.session import Base
+
+
+# Test database setup; StaticPool lets the audit writer thread see the same database
+TEST_DATABASE_URL = "sqlite:///:memory:"
+
+
+@pytest.fixture
+def session_factory():
+    """Create a session factory bound to a fresh in-memory database."""
+    engine = create_engine(
+        TEST_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(session_factory):
+    """Create a test database session."""
+    with session_factory() as session:
+        yield session
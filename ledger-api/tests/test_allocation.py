@@ -4,30 +4,11 @@ Tests for allocation service.
 import pytest
 from decimal import Decimal
 from uuid import uuid4
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from src.db.session import Base
 from src.models.models import LogicalAccount
 from src.services.allocation import AllocationService
 from src.schemas.schemas import AllocationRuleCreate, AllocationConfig
 
 
-# Test database setup
-TEST_DATABASE_URL = "sqlite:///:memory:"
-
-
-@pytest.fixture
-def db_session():
-    """Create a test database session."""
-    engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
-    Base.metadata.create_all(bind=engine)
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    session = TestingSessionLocal()
-    yield session
-    session.close()
-    Base.metadata.drop_all(bind=engine)
-
-
 @pytest.fixture
 def sample_accounts(db_session):
     """Create sample logical accounts for testing."""
@@ -144,6 +125,36 @@ def test_create_allocation_rule_invalid_source(db_session):
     assert "not found" in str(exc_info.value)
 
 
+def test_create_allocation_rule_invalid_destination(db_session, sample_accounts):
+    """Test creating allocation rule with a non-existent destination account."""
+    fake_dest_id = uuid4()
+    
+    allocation_config = [
+        AllocationConfig(
+            destination_account_id=sample_accounts["dest1"].id,
+            percentage=Decimal("50"),
+            priority=1
+        ),
+        AllocationConfig(
+            destination_account_id=fake_dest_id,
+            percentage=Decimal("50"),
+            priority=2
+        )
+    ]
+    
+    rule_data = AllocationRuleCreate(
+        rule_name="Invalid Destination Rule",
+        source_account_id=sample_accounts["source"].id,
+        allocation_config=allocation_config,
+        is_active=True
+    )
+    
+    with pytest.raises(ValueError) as exc_info:
+        AllocationService.create_allocation_rule(db_session, rule_data)
+    
+    assert str(fake_dest_id) in str(exc_info.value)
+
+
 def test_execute_allocation(db_session, sample_accounts):
     """Test executing an allocation rule."""
     source = sample_accounts["source"]
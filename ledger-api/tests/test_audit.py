@@ -0,0 +1,194 @@
+"""
+Tests for audit logging hooks.
+"""
+import pytest
+from uuid import uuid4
+
+from src.hooks.audit import AuditLogger, AuditWriter, audit_writer
+from src.models.models import AuditLog
+
+
+def test_log_action_inline_without_writer(session_factory):
+    """Test that entries are written inline when the writer is not running."""
+    with session_factory() as db:
+        entry = AuditLogger.log_create(
+            db=db,
+            entity_type="LogicalAccount",
+            entity_id=uuid4(),
+            entity_data={"account_name": "Inline"},
+            user_id="user-1"
+        )
+        
+        assert entry is not None
+        assert entry.action == "create"
+        assert db.query(AuditLog).count() == 1
+
+
+def test_log_action_queued_to_writer(session_factory):
+    """Test that the running writer persists queued entries on stop."""
+    entity_id = uuid4()
+    audit_writer.start(session_factory=session_factory)
+    try:
+        with session_factory() as db:
+            for _ in range(3):
+                assert AuditLogger.log_read(
+                    db=db, entity_type="LedgerTransaction", entity_id=entity_id
+                ) is None
+    finally:
+        audit_writer.stop()
+    
+    with session_factory() as db:
+        entries = db.query(AuditLog).all()
+    
+    assert len(entries) == 3
+    assert all(entry.entity_id == entity_id for entry in entries)
+    assert all(entry.timestamp is not None for entry in entries)
+
+
+def test_writer_keeps_good_rows_when_batch_fails(session_factory):
+    """Test that one unwritable row does not discard the rest of its batch."""
+    from datetime import datetime, timezone
+    
+    def entry(entity_type):
+        return {
+            "entity_type": entity_type, "entity_id": uuid4(), "action": "read",
+            "user_id": None, "changes": None, "ip_address": None,
+            "user_agent": None, "timestamp": datetime.now(timezone.utc),
+        }
+    
+    writer = AuditWriter()
+    writer.start(session_factory=session_factory)
+    try:
+        # entity_type is NOT NULL, so the middle row fails the batch insert
+        for entity_type in ("LogicalAccount", None, "LedgerTransaction"):
+            assert writer.submit(entry(entity_type)) is True
+    finally:
+        writer.stop()
+    
+    with session_factory() as db:
+        written = sorted(row.entity_type for row in db.query(AuditLog).all())
+    
+    assert written == ["LedgerTransaction", "LogicalAccount"]
+
+
+def test_writer_rejects_when_stopped():
+    """Test that submit refuses entries while the writer is not running."""
+    writer = AuditWriter()
+    
+    assert writer.submit({"action": "read"}) is False
+
+
+def test_writer_writes_every_entry_accepted_during_stop(session_factory):
+    """Test that entries accepted while stop runs are not lost behind it."""
+    import threading
+    from datetime import datetime, timezone
+    
+    writer = AuditWriter()
+    writer.start(session_factory=session_factory)
+    accepted = []
+    
+    def produce():
+        while True:
+            entry = {
+                "entity_type": "LedgerTransaction", "entity_id": uuid4(),
+                "action": "read", "timestamp": datetime.now(timezone.utc),
+            }
+            if not writer.submit(entry):
+                return
+            accepted.append(entry)
+    
+    producers = [threading.Thread(target=produce) for _ in range(4)]
+    for producer in producers:
+        producer.start()
+    while len(accepted) < 200:
+        pass
+    writer.stop()
+    for producer in producers:
+        producer.join()
+    
+    with session_factory() as db:
+        assert db.query(AuditLog).count() == len(accepted)
+
+
+def test_log_action_snapshots_changes(session_factory):
+    """Test that mutating changes after logging does not alter the entry."""
+    changes = {"after": {"balance": "10.00"}}
+    audit_writer.start(session_factory=session_factory)
+    try:
+        with session_factory() as db:
+            AuditLogger.log_action(
+                db=db, entity_type="LogicalAccount", entity_id=uuid4(),
+                action="update", changes=changes
+            )
+        changes["after"]["balance"] = "99.00"
+    finally:
+        audit_writer.stop()
+    
+    with session_factory() as db:
+        entry = db.query(AuditLog).one()
+    
+    assert entry.changes == {"after": {"balance": "10.00"}}
+
+
+def test_log_action_rejects_unknown_action(session_factory):
+    """Test that an action outside the allowed set is refused."""
+    with session_factory() as db:
+        with pytest.raises(ValueError):
+            AuditLogger.log_action(
+                db=db,
+                entity_type="LogicalAccount",
+                entity_id=uuid4(),
+                action="approve"
+            )
+        
+        assert db.query(AuditLog).count() == 0
+
+
+def test_request_context_read_once(session_factory):
+    """Test that client IP and user agent are recorded and cached per request."""
+    from starlette.requests import Request
+    
+    request = Request({
+        "type": "http",
+        "headers": [(b"user-agent", b"pytest-agent")],
+        "client": ("203.0.113.5", 4321),
+    })
+    
+    with session_factory() as db:
+        for _ in range(2):
+            entry = AuditLogger.log_read(
+                db=db, entity_type="LogicalAccount", entity_id=uuid4(), request=request
+            )
+            
+            assert entry.ip_address == "203.0.113.5"
+            assert entry.user_agent == "pytest-agent"
+    
+    assert request.state.audit_context == ("203.0.113.5", "pytest-agent")
+
+
+def test_copy_row_escapes_text_format():
+    """Test that COPY rows escape control characters and encode NULLs."""
+    from datetime import datetime, timezone
+    from decimal import Decimal
+    from src.hooks.audit import _copy_row
+    
+    entity_id = uuid4()
+    line = _copy_row({
+        "entity_type": "LogicalAccount",
+        "entity_id": entity_id,
+        "action": "update",
+        "user_id": None,
+        "changes": {"note": "tab\there", "amount": Decimal("1.50")},
+        "ip_address": None,
+        "user_agent": "agent\\1\nx",
+        "timestamp": datetime(2024, 1, 1, tzinfo=timezone.utc),
+    })
+    
+    assert line.endswith("\n") and line.count("\n") == 1
+    fields = line[:-1].split("\t")
+    assert len(fields) == 8
+    assert fields[0:4] == ["LogicalAccount", str(entity_id), "update", "\\N"]
+    assert fields[4] == '{"note":"tab\\\\there","amount":"1.50"}'
+    assert fields[5] == "\\N"
+    assert fields[6] == "agent\\\\1\\nx"
+    assert fields[7] == "2024-01-01T00:00:00+00:00"
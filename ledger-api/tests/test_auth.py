@@ -0,0 +1,160 @@
+"""
+Tests for JWT authentication dependencies.
+"""
+import pytest
+import time
+from datetime import datetime, timedelta, timezone
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from src.deps.auth import (
+    create_access_token, verify_token, get_current_user,
+    require_admin, require_role
+)
+
+
+def _credentials(token: str) -> HTTPAuthorizationCredentials:
+    """Wrap a raw token the way HTTPBearer hands it to dependencies."""
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+def test_token_round_trip():
+    """Test that an issued token verifies and yields its subject."""
+    token = create_access_token({"sub": "user-1", "role": "admin"})
+    
+    payload = verify_token(_credentials(token))
+    
+    assert payload["sub"] == "user-1"
+    assert isinstance(payload["exp"], int)
+    assert get_current_user(payload) == "user-1"
+    assert require_admin(payload) == "user-1"
+
+
+@pytest.fixture
+def non_utc_local_time(monkeypatch):
+    """Run with a non-UTC local zone, so naive values read as local time are off."""
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_datetime_time_claims_encoded_as_numeric_dates(non_utc_local_time):
+    """Test that datetime iat/nbf claims are encoded as integers and verify."""
+    issued = datetime.now(timezone.utc) - timedelta(seconds=10)
+    token = create_access_token({"sub": "user-1", "iat": issued, "nbf": issued})
+    
+    payload = verify_token(_credentials(token))
+    
+    assert payload["iat"] == int(issued.timestamp())
+    assert payload["nbf"] == int(issued.timestamp())
+    
+    # Naive values are UTC, as with PyJWT, whatever the local timezone
+    naive = issued.replace(tzinfo=None)
+    token = create_access_token({"sub": "user-1", "iat": naive, "nbf": naive})
+    
+    payload = verify_token(_credentials(token))
+    
+    assert payload["iat"] == int(issued.timestamp())
+    assert payload["nbf"] == int(issued.timestamp())
+
+
+def test_cached_payload_is_read_only():
+    """Test that the shared cached claims cannot be modified by a caller."""
+    token = create_access_token({"sub": "user-1", "role": "viewer"})
+    
+    payload = verify_token(_credentials(token))
+    with pytest.raises(TypeError):
+        payload["role"] = "admin"
+    
+    assert verify_token(_credentials(token))["role"] == "viewer"
+
+
+def test_expired_token_rejected():
+    """Test that an expired token is rejected."""
+    token = create_access_token({"sub": "user-1"}, expires_delta=timedelta(seconds=-5))
+    
+    with pytest.raises(HTTPException) as exc_info:
+        verify_token(_credentials(token))
+    
+    assert exc_info.value.status_code == 401
+
+
+def test_tampered_token_rejected():
+    """Test that a token with a modified signature is rejected."""
+    token = create_access_token({"sub": "user-1"})
+    
+    with pytest.raises(HTTPException) as exc_info:
+        verify_token(_credentials(token[:-2] + "xx"))
+    
+    assert exc_info.value.status_code == 401
+
+
+def test_each_failure_raises_a_fresh_exception():
+    """Test that rejected requests do not share one exception instance."""
+    token = create_access_token({"sub": "user-1"})
+    raised = []
+    
+    for _ in range(2):
+        with pytest.raises(HTTPException) as exc_info:
+            verify_token(_credentials(token[:-2] + "xx"))
+        raised.append(exc_info.value)
+    
+    assert raised[0] is not raised[1]
+    assert raised[1].headers == {"WWW-Authenticate": "Bearer"}
+
+
+def test_token_without_subject_rejected():
+    """Test that a token missing the sub claim is rejected."""
+    token = create_access_token({"role": "admin"})
+    
+    with pytest.raises(HTTPException) as exc_info:
+        verify_token(_credentials(token))
+    
+    assert exc_info.value.status_code == 401
+
+
+def test_require_admin_forbidden():
+    """Test that a non-admin token is refused by require_admin."""
+    payload = verify_token(_credentials(create_access_token({"sub": "user-1", "role": "viewer"})))
+    
+    with pytest.raises(HTTPException) as exc_info:
+        require_admin(payload)
+    
+    assert exc_info.value.status_code == 403
+
+
+def test_require_role_accepts_role_or_roles_claim():
+    """Test that require_role accepts a matching role or roles claim."""
+    checker = require_role("guardian", "admin")
+    
+    assert checker({"sub": "user-1", "role": "guardian"})["sub"] == "user-1"
+    assert checker({"sub": "user-2", "roles": ["viewer", "admin"]})["sub"] == "user-2"
+
+
+def test_require_role_forbidden():
+    """Test that require_role refuses tokens without a required role."""
+    checker = require_role("guardian")
+    
+    for payload in ({"sub": "user-1"}, {"sub": "user-1", "role": "viewer"},
+                    {"sub": "user-1", "roles": ["viewer"]}):
+        with pytest.raises(HTTPException) as exc_info:
+            checker(payload)
+        
+        assert exc_info.value.status_code == 403
+
+
+def test_require_role_rejects_malformed_claims():
+    """Test that non-string role claims are refused with 403, not a 500."""
+    # "n" would match a letter of the "nimda" string if it were iterated
+    checker = require_role("admin", "n")
+    
+    for payload in ({"sub": "user-1", "role": ["admin"]},
+                    {"sub": "user-1", "role": {"admin": True}},
+                    {"sub": "user-1", "roles": "nimda"},
+                    {"sub": "user-1", "roles": [["admin"]]}):
+        with pytest.raises(HTTPException) as exc_info:
+            checker(payload)
+        
+        assert exc_info.value.status_code == 403
@@ -0,0 +1,36 @@
+"""
+Tests for the application's response rendering.
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from src.db.session import Base, get_engine
+from src.deps.auth import create_access_token
+from src.main import app
+
+
+@pytest.fixture
+def client():
+    """Create a client for the app on its (in-memory) database."""
+    Base.metadata.create_all(bind=get_engine())
+    with TestClient(app) as test_client:
+        yield test_client
+    Base.metadata.drop_all(bind=get_engine())
+
+
+def test_create_account_returns_oversized_integer_metadata(client):
+    """Test that metadata orjson cannot encode is still returned, not a 500."""
+    token = create_access_token({"sub": "admin-1", "role": "admin"})
+    
+    response = client.post(
+        "/api/v1/treasury/accounts",
+        json={
+            "account_name": "Big Numbers",
+            "account_type": "asset",
+            "custom_metadata": {"n": 2 ** 70, "amount": "1.50"}
+        },
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    
+    assert response.status_code == 201
+    assert response.json()["custom_metadata"] == {"n": 2 ** 70, "amount": "1.50"}
@@ -0,0 +1,111 @@
+"""
+Tests for the Prometheus metrics middleware.
+"""
+import pytest
+
+pytest.importorskip("prometheus_client")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from src.middleware.metrics import PrometheusMiddleware, render_metrics
+
+
+@pytest.fixture
+def client():
+    """Create a client for a small app wrapped in the middleware."""
+    app = FastAPI()
+    app.add_middleware(PrometheusMiddleware)
+    
+    @app.get("/items/{item_id}")
+    def get_item(item_id: int):
+        return {"id": item_id}
+    
+    @app.get("/metrics")
+    def metrics():
+        return render_metrics()
+    
+    return TestClient(app)
+
+
+def _count(route, method, code):
+    return REGISTRY.get_sample_value(
+        "request_duration_seconds_count",
+        {"route": route, "method": method, "code": code}
+    ) or 0
+
+
+def test_requests_labelled_with_route_template(client):
+    """Test that requests are recorded under the route, not the raw path."""
+    before = _count("/items/{item_id}", "GET", "200")
+    
+    client.get("/items/1")
+    client.get("/items/2")
+    
+    assert _count("/items/{item_id}", "GET", "200") == before + 2
+
+
+def test_unmatched_paths_share_a_label(client):
+    """Test that unknown paths do not create a series per path."""
+    before = _count("unmatched", "GET", "404")
+    
+    client.get("/no-such-path")
+    
+    assert _count("unmatched", "GET", "404") == before + 1
+
+
+def test_metrics_endpoint_exposes_histogram(client):
+    """Test that the scrape endpoint renders the request histogram."""
+    client.get("/items/1")
+    
+    response = client.get("/metrics")
+    
+    assert response.status_code == 200
+    assert "request_duration_seconds_bucket" in response.text
+
+
+def test_track_pool_counts_checked_out_connections():
+    """Test that the pool gauge follows checkouts and is registered once."""
+    from sqlalchemy import create_engine
+    from src.middleware.metrics import track_pool
+    
+    engine = create_engine("sqlite://")
+    track_pool("test", engine)
+    track_pool("test", engine)
+    
+    def in_use():
+        return REGISTRY.get_sample_value("db_pool_in_use", {"pool": "test"})
+    
+    with engine.connect():
+        assert in_use() == 1
+    
+    assert in_use() == 0
+
+
+def test_multiprocess_metrics_aggregate_worker_files(tmp_path):
+    """Test that /metrics reports the totals of every worker in multiprocess mode."""
+    import os
+    import subprocess
+    import sys
+    
+    # prometheus_client picks multiprocess mode on import, so each "worker"
+    # is a fresh process; only the second one renders
+    script = (
+        "import sys\n"
+        "from src.middleware.metrics import REQUEST_DURATION, render_metrics\n"
+        "REQUEST_DURATION.labels('/items/{item_id}', 'GET', '200').observe(0.1)\n"
+        "if sys.argv[1] == 'render':\n"
+        "    print(render_metrics().body.decode())\n"
+    )
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    
+    def run(mode):
+        return subprocess.run(
+            [sys.executable, "-c", script, mode], env=env, capture_output=True, text=True, check=True
+        ).stdout
+    
+    run("observe")
+    output = run("render")
+    
+    assert 'request_duration_seconds_count{code="200",method="GET",route="/items/{item_id}"} 2.0' in output
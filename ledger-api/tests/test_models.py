@@ -0,0 +1,28 @@
+"""
+Tests for the portable column types.
+"""
+from src.db.session import _json_deserializer, _json_serializer
+from src.models.models import LogicalAccount
+
+
+def test_json_column_round_trips_values_orjson_rejects(db_session):
+    """Test that oversized integers and non-string keys are stored, not a 500."""
+    account = LogicalAccount(
+        account_name="Big Numbers",
+        account_type="asset",
+        custom_metadata={"n": 2 ** 70, 7: "seven"}
+    )
+    db_session.add(account)
+    db_session.commit()
+    db_session.expire_all()
+    
+    stored = db_session.get(LogicalAccount, account.id).custom_metadata
+    
+    assert stored == {"n": 2 ** 70, "7": "seven"}
+    assert isinstance(stored["n"], int)
+
+
+def test_json_serializer_matches_json_dumps_keys():
+    """Test that non-string keys are stringified by the orjson path."""
+    assert _json_serializer({1: "a", "b": 2}) == '{"1":"a","b":2}'
+    assert _json_deserializer(b'{"n":18446744073709551616}') == {"n": 2 ** 64}
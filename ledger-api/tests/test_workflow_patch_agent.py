@@ -4,11 +4,8 @@ Tests for Workflow Patch Agent service.
 import pytest
 from decimal import Decimal
 from uuid import uuid4
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 from datetime import datetime
 
-from src.db.session import Base
 from src.models.models import WorkflowPatch, WorkflowAnalysis
 from src.services.workflow_patch_agent import WorkflowPatchAgent
 from src.schemas.schemas import (
@@ -17,22 +14,6 @@ from src.schemas.schemas import (
 )
 
 
-# Test database setup
-TEST_DATABASE_URL = "sqlite:///:memory:"
-
-
-@pytest.fixture
-def db_session():
-    """Create a test database session."""
-    engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
-    Base.metadata.create_all(bind=engine)
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    session = TestingSessionLocal()
-    yield session
-    session.close()
-    Base.metadata.drop_all(bind=engine)
-
-
 @pytest.fixture
 def patch_agent(db_session):
     """Create a WorkflowPatchAgent instance."""